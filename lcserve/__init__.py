@@ -12,8 +12,33 @@ def _ignore_warnings():
 
 _ignore_warnings()
 
-from .backend import download_df, serving, slackbot, upload_df
-from .backend.slackbot import SlackBot
-from .backend.slackbot.memory import MemoryMode, get_memory
+from ._version import __version__
 
-__version__ = '0.0.57'
+# The public API is resolved lazily, so that `import lcserve` (and hence the CLI)
+# doesn't pull in jina, langchain & friends until they are actually needed.
+_lazy_names = (
+    'download_df',
+    'serving',
+    'slackbot',
+    'upload_df',
+    'SlackBot',
+    'MemoryMode',
+    'get_memory',
+)
+
+
+def __getattr__(name):
+    if name not in _lazy_names:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    from .backend import download_df, serving, slackbot, upload_df
+    from .backend.slackbot import SlackBot
+    from .backend.slackbot.memory import MemoryMode, get_memory
+
+    _locals = locals()
+    globals().update({n: _locals[n] for n in _lazy_names})
+    return _locals[name]
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_names))
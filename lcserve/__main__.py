@@ -1,35 +1,26 @@
+import inspect
 import os
 import sys
 from typing import List
 
 import click
-from jcloud.constants import Phase
-from jina import Flow
 
-from . import __version__
-from .config import resolve_jcloud_config, validate_jcloud_config_callback
-from .flow import (
+from ._version import __version__
+from .config import (
+    DEFAULT_TIMEOUT,
+    resolve_jcloud_config,
+    validate_jcloud_config_callback,
+)
+from .constants import (
     APP_NAME,
     AUTOGPT_APP_NAME,
     BABYAGI_APP_NAME,
-    DEFAULT_TIMEOUT,
     PANDAS_AI_APP_NAME,
     PDF_QNA_APP_NAME,
     SLACK_BOT_NAME,
     SLACKBOT_DEMO_APP_NAME,
     ExportKind,
-    create_slack_app_manifest,
-    deploy_app_on_jcloud,
-    get_app_status_on_jcloud,
-    get_flow_dict,
-    get_flow_yaml,
-    get_module_dir,
-    get_uri,
-    list_apps_on_jcloud,
-    load_local_df,
-    remove_app_on_jcloud,
     syncify,
-    update_requirements,
 )
 
 
@@ -39,6 +30,10 @@ def serve_locally(
     port: int = 8080,
     env: str = None,
 ):
+    from jina import Flow
+
+    from .flow import get_flow_yaml
+
     sys.path.append(os.getcwd())
     f_yaml = get_flow_yaml(
         module_str=module_str,
@@ -71,7 +66,13 @@ async def serve_on_jcloud(
     lcserve_app: bool = False,
 ) -> str:
     from .backend.playground.utils.helper import get_random_tag
-    from .flow import push_app_to_hubble
+    from .flow import (
+        deploy_app_on_jcloud,
+        get_app_status_on_jcloud,
+        get_flow_dict,
+        get_module_dir,
+        push_app_to_hubble,
+    )
 
     module_dir, is_websocket = get_module_dir(
         module_str=module_str,
@@ -130,6 +131,8 @@ async def serve_babyagi_on_jcloud(
     verbose: bool = False,
     public: bool = False,
 ):
+    from .flow import update_requirements
+
     requirements = requirements or []
     update_requirements(
         path=os.path.join(
@@ -168,6 +171,8 @@ async def serve_autogpt_on_jcloud(
     verbose: bool = False,
     public: bool = False,
 ):
+    from .flow import update_requirements
+
     requirements = requirements or []
     update_requirements(
         path=os.path.join(
@@ -288,6 +293,7 @@ async def serve_slackbot_demo_on_jcloud(
 
 def upload_df_to_jcloud(module: str, name: str):
     from . import upload_df
+    from .flow import load_local_df
 
     df = load_local_df(module)
     df_id = upload_df(df, name)
@@ -297,51 +303,52 @@ def upload_df_to_jcloud(module: str, name: str):
 
 
 _hubble_push_options = [
-    click.option(
-        '--image-name',
+    click.Option(
+        ['--image-name'],
         type=str,
         required=False,
         help='Name of the image to be pushed.',
     ),
-    click.option(
-        '--image-tag',
+    click.Option(
+        ['--image-tag'],
         type=str,
         default='latest',
         required=False,
         help='Tag of the image to be pushed.',
     ),
-    click.option(
-        '--platform',
+    click.Option(
+        ['--platform'],
         type=str,
         required=False,
         help='Platform of Docker image needed for the deployment is built on.',
     ),
-    click.option(
-        '--requirements',
+    click.Option(
+        ['--requirements'],
         default=None,
         type=str,
-        help='''Pass either
+        # `click.Option` doesn't dedent help texts the way `click.option` does.
+        help=inspect.cleandoc('''Pass either
 
             1) multiple requirements or,
             2) a path to a requirements.txt/pyproject.toml file or,
-            3) a directory containing requirements.txt/pyproject.toml file.''',
+            3) a directory containing requirements.txt/pyproject.toml file.'''),
         multiple=True,
     ),
-    click.option(
-        '--version',
+    click.Option(
+        ['--version'],
         type=str,
         default='latest',
         help='Version of serving gateway to be used.',
         show_default=False,
     ),
-    click.option(
-        '--verbose',
+    click.Option(
+        ['--verbose'],
         is_flag=True,
         help='Verbose mode.',
         show_default=True,
     ),
-    click.option(
-        '--public',
+    click.Option(
+        ['--public'],
         is_flag=True,
         help='Push the image publicly.',
         default=False,
@@ -351,72 +358,72 @@ _hubble_push_options = [
 
 
 _jcloud_shared_options = [
-    click.option(
-        '--app-id',
+    click.Option(
+        ['--app-id'],
         type=str,
         default=None,
         help='AppID of the deployed agent to be updated.',
         show_default=True,
     ),
-    click.option(
-        '--requirements',
+    click.Option(
+        ['--requirements'],
         default=None,
         type=str,
-        help='''Pass either 
-        1) multiple requirements or,
-        2) a path to a requirements.txt/pyproject.toml file or,
-        3) a directory containing requirements.txt/pyproject.toml file.''',
+        help=inspect.cleandoc('''Pass either 
+            1) multiple requirements or,
+            2) a path to a requirements.txt/pyproject.toml file or,
+            3) a directory containing requirements.txt/pyproject.toml file.'''),
         multiple=True,
     ),
-    click.option(
-        '--version',
+    click.Option(
+        ['--version'],
         type=str,
         default='latest',
         help='Version of serving gateway to be used.',
         show_default=False,
     ),
-    click.option(
-        '--timeout',
+    click.Option(
+        ['--timeout'],
         type=int,
         default=DEFAULT_TIMEOUT,
         help='Total request timeout in seconds.',
         show_default=True,
     ),
-    click.option(
-        '--platform',
+    click.Option(
+        ['--platform'],
         type=str,
         default=None,
         help='Platform of Docker image needed for the deployment is built on.',
         show_default=False,
     ),
-    click.option(
-        '--config',
+    click.Option(
+        ['--config'],
         type=click.Path(exists=True),
         help='Path to the config file',
         callback=validate_jcloud_config_callback,
         show_default=False,
     ),
-    click.option(
-        '--env',
+    click.Option(
+        ['--env'],
         type=click.Path(exists=True),
         help='Path to the environment file',
         show_default=False,
     ),
-    click.option(
-        '--cors',
+    click.Option(
+        ['--cors'],
         is_flag=True,
         help='Enable CORS.',
         default=True,
         show_default=True,
     ),
-    click.option(
-        '--verbose',
+    click.Option(
+        ['--verbose'],
         is_flag=True,
         help='Verbose mode.',
         show_default=True,
     ),
-    click.option(
-        '--public',
+    click.Option(
+        ['--public'],
         is_flag=True,
         help='Push the image publicly.',
         default=False,
@@ -425,16 +432,19 @@ _jcloud_shared_options = [
 ]
 
 
-def hubble_push_options(func):
-    for option in reversed(_hubble_push_options):
-        func = option(func)
+def _add_params(func, params):
+    # The options are built once and shared by every command using them. Decorators
+    # collect params bottom-up, so they are appended in reverse to keep the listed order.
+    func.__click_params__ = getattr(func, '__click_params__', []) + params[::-1]
     return func
 
 
+def hubble_push_options(func):
+    return _add_params(func, _hubble_push_options)
+
+
 def jcloud_shared_options(func):
-    for option in reversed(_jcloud_shared_options):
-        func = option(func)
-    return func
+    return _add_params(func, _jcloud_shared_options)
 
 
 @click.group()
@@ -476,7 +486,7 @@ def push(
     verbose,
     public,
 ):
-    from .flow import push_app_to_hubble
+    from .flow import get_module_dir, get_uri, push_app_to_hubble
 
     module_dir, _ = get_module_dir(
         module_str=module_str,
@@ -926,6 +936,8 @@ def slack_app_manifest(name):
     from rich.syntax import Syntax
     from rich.text import Text
 
+    from .flow import create_slack_app_manifest
+
     syntax = Syntax(create_slack_app_manifest(name), "yaml")
     console = Console()
     console.print(Rule("App Manifest", style="bold green"))
@@ -938,19 +950,16 @@ def slack_app_manifest(name):
     console.print(Rule(style="bold green"))
 
 
+# Spelled out rather than built from `jcloud.constants.Phase`, so that the CLI doesn't
+# import jcloud just to render its help.
+_DEFAULT_PHASES = 'Serving,Failed,Starting,Updating,Paused'
+
+
 @serve.command(help='List all deployed apps.')
 @click.option(
     '--phase',
     type=str,
-    default=','.join(
-        [
-            Phase.Serving,
-            Phase.Failed,
-            Phase.Starting,
-            Phase.Updating,
-            Phase.Paused,
-        ]
-    ),
+    default=_DEFAULT_PHASES,
     help='Deployment phase for the app.',
     show_default=True,
 )
@@ -964,6 +973,8 @@ def slack_app_manifest(name):
 @click.help_option('-h', '--help')
 @syncify
 async def list(phase, name):
+    from .flow import list_apps_on_jcloud
+
     await list_apps_on_jcloud(phase=phase, name=name)
 
 
@@ -972,6 +983,8 @@ async def list(phase, name):
 @click.help_option('-h', '--help')
 @syncify
 async def status(app_id):
+    from .flow import get_app_status_on_jcloud
+
     await get_app_status_on_jcloud(app_id)
 
 
@@ -980,6 +993,8 @@ async def status(app_id):
 @click.help_option('-h', '--help')
 @syncify
 async def remove(app_id):
+    from .flow import remove_app_on_jcloud
+
     await remove_app_on_jcloud(app_id)
 
 
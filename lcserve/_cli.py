@@ -0,0 +1,14 @@
+import sys
+
+
+def main():
+    # `lc-serve -v` only needs the version, so it shouldn't pay for importing the CLI.
+    if len(sys.argv) == 2 and sys.argv[1] in ('-v', '--version'):
+        from ._version import __version__
+
+        print(f'lc-serve, version {__version__}')
+        return
+
+    from .__main__ import serve
+
+    serve()
@@ -999,6 +999,7 @@ def create_websocket_route(
                                 'streaming_handler': StreamingWebsocketCallbackHandler(
                                     websocket=websocket,
                                     output_model=output_model,
+                                    loop=asyncio.get_running_loop(),
                                 ),
                                 'async_streaming_handler': AsyncStreamingWebsocketCallbackHandler(
                                     websocket=websocket,
@@ -1,9 +1,11 @@
 import asyncio
+import builtins
 import copy
 import json
 import logging
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
+import threading
+from functools import partial, wraps
+from typing import Any, Coroutine, Dict, List, Optional, Set, Union
 from uuid import UUID
 
 from fastapi import WebSocket
@@ -20,8 +22,25 @@ from opentelemetry.trace import (
 )
 from pydantic import BaseModel, ValidationError
 
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+except ImportError:
+    _dumps = partial(json.dumps, default=str, separators=(',', ':'))
+
+
+_logger = logging.getLogger(__name__)
+_tracing_logger: Optional[logging.Logger] = None
+
 
 def get_tracing_logger():
+    global _tracing_logger
+    if _tracing_logger is not None:
+        return _tracing_logger
+
     logger = logging.getLogger("tracing")
     logger.setLevel(logging.INFO)
     logger.propagate = False
@@ -33,43 +52,98 @@ def get_tracing_logger():
         handler.setFormatter(formatter)
         logger.addHandler(handler)
 
+    _tracing_logger = logger
     return logger
 
 
-_span_map = {}
+def _trace_info(
+    trace: str,
+    span: str,
+    action: str,
+    prompts: str = "",
+    outputs: str = "",
+    tokens: int = 0,
+    cost: float = 0,
+    total_tokens: int = 0,
+    total_cost: float = 0,
+) -> Dict[str, Any]:
+    return {
+        "trace": trace,
+        "span": span,
+        "action": action,
+        "prompts": prompts,
+        "outputs": outputs,
+        "tokens": tokens,
+        "cost": cost,
+        "total_tokens": total_tokens,
+        "total_cost": total_cost,
+    }
+
+
+_TRACED_EVENTS = (
+    "on_llm_start",
+    "on_llm_end",
+    "on_chain_start",
+    "on_chain_end",
+    "on_agent_action",
+    "on_tool_start",
+    "on_tool_end",
+)
 
 
-@dataclass
-class TraceInfo:
-    trace: str
-    span: str
-    action: str
-    prompts: str = ""
-    outputs: str = ""
-    tokens: int = 0
-    cost: float = 0
-    total_tokens: int = 0
-    total_cost: float = 0
+def _noop(*args, **kwargs) -> None:
+    pass
+
+
+async def _anoop(*args, **kwargs) -> None:
+    pass
 
 
 class TracingCallbackHandlerMixin(BaseCallbackHandler):
+    __slots__ = (
+        'tracer',
+        'parent_span',
+        '_parent_ctx',
+        'logger',
+        'cost_per_llm_op',
+        'total_tokens',
+        'total_cost',
+        '_spans',
+    )
+
     def __init__(self, tracer: Tracer, parent_span: Span):
         super().__init__()
         self.tracer = tracer
         self.parent_span = parent_span
+        # The parent span is fixed for the handler, so is the context spans start from.
+        self._parent_ctx = set_span_in_context(parent_span)
         self.logger = get_tracing_logger()
         self.cost_per_llm_op = 0
         self.total_tokens = 0
         self.total_cost = 0
+        self._spans: Dict[UUID, Span] = {}
+        if not tracer:
+            self._disable_tracing()
+
+    def _disable_tracing(self):
+        # Tracing is on or off for the lifetime of the handler, so instead of checking
+        # `self.tracer` on every event, shadow the tracing callbacks with no-ops.
+        # Callbacks overridden by a subclass (e.g. OpenAI cost tracking) are left alone.
+        for name in _TRACED_EVENTS:
+            method = getattr(type(self), name)
+            if method is getattr(TracingCallbackHandlerMixin, name):
+                setattr(self, name, _noop)
+            elif method is getattr(AsyncTracingCallbackHandler, name):
+                setattr(self, name, _anoop)
 
     def _register_span(self, run_id, span):
-        _span_map[run_id] = span
+        self._spans[run_id] = span
 
     def _current_span(self, run_id):
-        return _span_map.get(run_id)
+        return self._spans.get(run_id)
 
     def _end_span(self, run_id):
-        span = _span_map.pop(run_id, None)
+        span = self._spans.pop(run_id, None)
         if span:
             span.end()
 
@@ -88,23 +162,27 @@ class TracingCallbackHandlerMixin(BaseCallbackHandler):
         operation = "langchain.llm"
 
         try:
-            context = set_span_in_context(self.parent_span)
+            attributes = {
+                "otel.operation.name": operation,
+                "num_processed_prompts": len(prompts),
+                "prompts_len": sum(map(len, prompts)),
+            }
             with self.tracer.start_as_current_span(
-                "llm", context=context, end_on_exit=False
+                "llm",
+                context=self._parent_ctx,
+                attributes=attributes,
+                end_on_exit=False,
             ) as span:
-                span.set_attribute("otel.operation.name", operation)
-                prompts_len = sum([len(prompt) for prompt in prompts])
-                span.set_attribute("num_processed_prompts", len(prompts))
-                span.set_attribute("prompts_len", prompts_len)
                 span.add_event("prompts", {"data": prompts})
 
-                trace_info = TraceInfo(
-                    trace=format_trace_id(span.context.trace_id),
-                    span=format_span_id(span.context.span_id),
-                    action="on_llm_start",
-                    prompts=''.join(prompts),
-                )
-                self.logger.info(json.dumps(trace_info.__dict__))
+                if self.logger.isEnabledFor(logging.INFO):
+                    trace_info = _trace_info(
+                        trace=format_trace_id(span.context.trace_id),
+                        span=format_span_id(span.context.span_id),
+                        action="on_llm_start",
+                        prompts=''.join(prompts),
+                    )
+                    self.logger.info(_dumps(trace_info))
                 self._register_span(run_id, span)
         except Exception:
             self.logger.error("Error in tracing callback handler", exc_info=True)
@@ -120,8 +198,7 @@ class TracingCallbackHandlerMixin(BaseCallbackHandler):
             if response.llm_output:
                 token_usage = response.llm_output["token_usage"]
 
-                for k, v in token_usage.items():
-                    span.set_attribute(k, v)
+                span.set_attributes(token_usage)
 
                 # total_tokens in token_usage is the total tokens (prompt + completion) for a single llm op
                 tokens_per_llm_op = token_usage.get("total_tokens", 0)
@@ -130,17 +207,18 @@ class TracingCallbackHandlerMixin(BaseCallbackHandler):
                 [" ".join([l.text for l in lst]) for lst in response.generations]
             )
 
-            trace_info = TraceInfo(
-                trace=format_trace_id(span.context.trace_id),
-                span=format_span_id(span.context.span_id),
-                action="on_llm_end",
-                outputs=texts,
-                tokens=tokens_per_llm_op,
-                cost=round(self.cost_per_llm_op, 3),
-                total_tokens=round(self.total_tokens, 3),
-                total_cost=round(self.total_cost, 3),
-            )
-            self.logger.info(json.dumps(trace_info.__dict__))
+            if self.logger.isEnabledFor(logging.INFO):
+                trace_info = _trace_info(
+                    trace=format_trace_id(span.context.trace_id),
+                    span=format_span_id(span.context.span_id),
+                    action="on_llm_end",
+                    outputs=texts,
+                    tokens=tokens_per_llm_op,
+                    cost=round(self.cost_per_llm_op, 3),
+                    total_tokens=round(self.total_tokens, 3),
+                    total_cost=round(self.total_cost, 3),
+                )
+                self.logger.info(_dumps(trace_info))
             span.add_event("outputs", {"data": texts})
         except Exception:
             self.logger.error("Error in tracing callback handler", exc_info=True)
@@ -162,17 +240,18 @@ class TracingCallbackHandlerMixin(BaseCallbackHandler):
         operation = "langchain.chain"
 
         try:
-            context = set_span_in_context(self.parent_span)
             with self.tracer.start_as_current_span(
-                "chain", context=context, end_on_exit=False
+                "chain",
+                context=self._parent_ctx,
+                attributes={"otel.operation.name": operation},
+                end_on_exit=False,
             ) as span:
-                span.set_attribute("otel.operation.name", operation)
 
                 # If the event is from slack bot, we need to pop chat_history as it's not serializable,
                 # nor do we need the chat_history anyway for tracing.
                 copied_inputs = copy.deepcopy(inputs)
                 copied_inputs.pop('chat_history', None)
-                span.add_event("inputs", {"data": json.dumps(copied_inputs)})
+                span.add_event("inputs", {"data": _dumps(copied_inputs)})
                 self._register_span(run_id, span)
         except Exception:
             self.logger.error("Error in tracing callback handler", exc_info=True)
@@ -190,7 +269,7 @@ class TracingCallbackHandlerMixin(BaseCallbackHandler):
 
         try:
             span = self._current_span(run_id)
-            span.add_event("outputs", {"data": json.dumps(outputs)})
+            span.add_event("outputs", {"data": _dumps(outputs)})
         except Exception:
             self.logger.error("Error in tracing callback handler", exc_info=True)
         finally:
@@ -235,11 +314,12 @@ class TracingCallbackHandlerMixin(BaseCallbackHandler):
         operation = "langchain.tools"
 
         try:
-            context = set_span_in_context(self.parent_span)
             with self.tracer.start_as_current_span(
-                "tool", context=context, end_on_exit=False
+                "tool",
+                context=self._parent_ctx,
+                attributes={"otel.operation.name": operation},
+                end_on_exit=False,
             ) as span:
-                span.set_attribute("otel.operation.name", operation)
                 span.add_event("input", {"data": input_str})
                 self._register_span(run_id, span)
         except Exception:
@@ -316,11 +396,12 @@ class TracingCallbackHandlerMixin(BaseCallbackHandler):
         pass
 
 
-class TracingCallbackHandler(TracingCallbackHandlerMixin):
-    pass
+TracingCallbackHandler = TracingCallbackHandlerMixin
 
 
 class OpenAITracingCallbackHandler(TracingCallbackHandlerMixin, OpenAICallbackHandler):
+    __slots__ = ()
+
     def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
         cost_before_op = self.total_cost
         OpenAICallbackHandler.on_llm_end(self, response, run_id=run_id, **kwargs)
@@ -331,10 +412,46 @@ class OpenAITracingCallbackHandler(TracingCallbackHandlerMixin, OpenAICallbackHa
 
 
 class AsyncStreamingWebsocketCallbackHandler(StreamingStdOutCallbackHandler):
-    def __init__(self, websocket: "WebSocket", output_model: "BaseModel"):
+    """Streams LLM tokens to the websocket.
+
+    Tokens are coalesced and sent as a single message every `flush_interval` seconds,
+    or as soon as `flush_size` characters are buffered. Pass `flush_interval=0` to send
+    every token as it arrives.
+    """
+
+    __slots__ = (
+        'websocket',
+        'output_model',
+        'flush_interval',
+        'flush_size',
+        '_buf',
+        '_buf_size',
+        '_flush_task',
+        '_flush_lock',
+        '_template',
+    )
+
+    def __init__(
+        self,
+        websocket: "WebSocket",
+        output_model: "BaseModel",
+        flush_interval: float = 0.02,
+        flush_size: int = 2048,
+    ):
         super().__init__()
         self.websocket = websocket
         self.output_model = output_model
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._buf: List[str] = []
+        self._buf_size = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        # Validate the output model once, and only swap `result` for every streamed chunk.
+        try:
+            self._template = self.output_model(result="", error="").dict()
+        except ValidationError:
+            self._template = {"result": "", "error": ""}
 
     @property
     def always_verbose(self) -> bool:
@@ -344,109 +461,173 @@ class AsyncStreamingWebsocketCallbackHandler(StreamingStdOutCallbackHandler):
     def is_async(self) -> bool:
         return True
 
-    async def on_llm_new_token(self, token: str, **kwargs) -> None:
-        try:
-            data = self.output_model(result=token, error="").dict()
-        except ValidationError:
-            data = {"result": token, "error": ""}
-        await self.websocket.send_json(data)
+    def _payload(self, result: str) -> Dict[str, Any]:
+        payload = self._template.copy()
+        payload["result"] = result
+        return payload
+
+    async def _send(self, result: str) -> None:
+        await self.websocket.send_text(_dumps(self._payload(result)))
+
+    def _get_flush_lock(self) -> asyncio.Lock:
+        # Created on first use rather than in `__init__`, so that on python<3.10 the lock
+        # binds to the loop the handler sends on, not the one it was constructed on.
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        return self._flush_lock
+
+    async def _send_buffered(self) -> None:
+        # must be called with the flush lock held, so that messages keep their order
+        if self._flush_task is not None:
+            # the buffer is being flushed now, the pending timer has nothing left to send
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        if not self._buf:
+            return
 
-    async def on_text(self, text: str, **kwargs: Any) -> None:
+        result = "".join(self._buf)
+        self._buf.clear()
+        self._buf_size = 0
+        await self._send(result)
+
+    async def _flush(self) -> None:
+        async with self._get_flush_lock():
+            await self._send_buffered()
+
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._flush_task = None
+        # Nobody awaits this task, so errors (e.g. the client is gone) are logged here.
         try:
-            data = self.output_model(result=text, error="").dict()
-        except ValidationError:
-            data = {"result": text, "error": ""}
-        await self.websocket.send_json(data)
+            await self._flush()
+        except Exception as e:
+            _logger.warning(f'Could not send streamed tokens to the websocket: {e}')
 
+    async def on_llm_new_token(self, token: str, **kwargs) -> None:
+        self._buf.append(token)
+        self._buf_size += len(token)
+        if self.flush_interval <= 0 or self._buf_size >= self.flush_size:
+            await self._flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(
+                self._flush_after(self.flush_interval)
+            )
 
-class AsyncTracingCallbackHandler(TracingCallbackHandler):
-    def __init__(self, **kwargs: Any) -> None:
-        super().__init__(**kwargs)
+    async def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        await self._flush()
 
-    async def on_llm_start(
-        self,
-        serialized: Dict[str, Any],
-        prompts: List[str],
-        *,
-        run_id: UUID,
-        parent_run_id: Optional[UUID] = None,
-        **kwargs: Any,
+    async def on_llm_error(
+        self, error: Union[Exception, KeyboardInterrupt], **kwargs: Any
     ) -> None:
-        super().on_llm_start(
-            serialized, prompts, run_id=run_id, parent_run_id=parent_run_id, **kwargs
-        )
+        await self._flush()
 
-    async def on_llm_end(
-        self, response: LLMResult, *, run_id: UUID, **kwargs: Any
-    ) -> None:
-        super().on_llm_end(response, run_id=run_id, **kwargs)
+    async def on_text(self, text: str, **kwargs: Any) -> None:
+        async with self._get_flush_lock():
+            await self._send_buffered()
+            await self._send(text)
 
-    async def on_chain_start(
-        self,
-        serialized: Dict[str, Any],
-        inputs: Dict[str, Any],
-        *,
-        run_id: UUID,
-        parent_run_id: Optional[UUID] = None,
-        **kwargs: Any,
-    ) -> None:
-        super().on_chain_start(
-            serialized, inputs, run_id=run_id, parent_run_id=parent_run_id, **kwargs
-        )
 
-    async def on_chain_end(
-        self, outputs: Dict[str, Any], *, run_id: UUID, **kwargs: Any
-    ) -> None:
-        super().on_chain_end(outputs, run_id=run_id, **kwargs)
+def _make_async(fn):
+    """Wraps a sync tracing callback in a coroutine function."""
 
-    async def on_agent_action(
-        self,
-        action: AgentAction,
-        *,
-        run_id: UUID,
-        parent_run_id: Optional[UUID] = None,
-        **kwargs: Any,
-    ) -> None:
-        super().on_agent_action(
-            action, run_id=run_id, parent_run_id=parent_run_id, **kwargs
-        )
+    @wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        return fn(self, *args, **kwargs)
 
-    async def on_tool_start(
-        self,
-        serialized: Dict[str, Any],
-        input_str: str,
-        *,
-        run_id: UUID,
-        parent_run_id: Optional[UUID] = None,
-        **kwargs: Any,
-    ) -> None:
-        super().on_tool_start(
-            serialized, input_str, run_id=run_id, parent_run_id=parent_run_id, **kwargs
-        )
+    return wrapper
+
+
+class AsyncTracingCallbackHandler(TracingCallbackHandler):
+    __slots__ = ()
 
-    async def on_tool_end(self, output: str, *, run_id: UUID, **kwargs: Any) -> None:
-        super().on_tool_end(output, run_id=run_id, **kwargs)
+    on_llm_start = _make_async(TracingCallbackHandlerMixin.on_llm_start)
+    on_llm_end = _make_async(TracingCallbackHandlerMixin.on_llm_end)
+    on_chain_start = _make_async(TracingCallbackHandlerMixin.on_chain_start)
+    on_chain_end = _make_async(TracingCallbackHandlerMixin.on_chain_end)
+    on_agent_action = _make_async(TracingCallbackHandlerMixin.on_agent_action)
+    on_tool_start = _make_async(TracingCallbackHandlerMixin.on_tool_start)
+    on_tool_end = _make_async(TracingCallbackHandlerMixin.on_tool_end)
+
+
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Returns an event loop running forever in a daemon thread, started on first use."""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = asyncio.new_event_loop()
+            threading.Thread(target=_background_loop.run_forever, daemon=True).start()
+    return _background_loop
 
 
 class StreamingWebsocketCallbackHandler(AsyncStreamingWebsocketCallbackHandler):
+    __slots__ = ('loop', '_tasks')
+
+    def __init__(
+        self,
+        websocket: "WebSocket",
+        output_model: "BaseModel",
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(websocket=websocket, output_model=output_model, **kwargs)
+        # Sync callbacks are usually invoked from a worker thread, so we submit the sends
+        # to the loop serving the websocket instead of spinning up a new loop per token.
+        self.loop = loop or _get_background_loop()
+        # The loop only keeps weak references to tasks, so hold on to the ones we create.
+        self._tasks: Set[asyncio.Task] = set()
+
     @property
     def is_async(self) -> bool:
         return False
 
+    def _run(self, coro: Coroutine) -> None:
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self.loop:
+            # Called from the loop's own thread (e.g. a sync tool run inside an async
+            # app), blocking on the result here would deadlock the loop.
+            task = self.loop.create_task(coro)
+            self._tasks.add(task)
+            task.add_done_callback(self._on_task_done)
+        else:
+            asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        # Nobody awaits this task, so errors (e.g. the client is gone) are logged here.
+        if not task.cancelled() and task.exception() is not None:
+            _logger.warning(
+                f'Could not send streamed tokens to the websocket: {task.exception()}'
+            )
+
     def on_llm_new_token(self, token: str, **kwargs) -> None:
-        asyncio.run(super().on_llm_new_token(token, **kwargs))
+        self._run(super().on_llm_new_token(token, **kwargs))
 
-    def on_text(self, text: str, **kwargs: Any) -> None:
-        asyncio.run(super().on_text(text, **kwargs))
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        self._run(super().on_llm_end(response, **kwargs))
 
+    def on_llm_error(
+        self, error: Union[Exception, KeyboardInterrupt], **kwargs: Any
+    ) -> None:
+        self._run(super().on_llm_error(error, **kwargs))
 
-class _HumanInput(BaseModel):
-    prompt: str
+    def on_text(self, text: str, **kwargs: Any) -> None:
+        self._run(super().on_text(text, **kwargs))
 
 
 class InputWrapper:
     """Wrapper for human input."""
 
+    __slots__ = ('loop', 'websocket', 'recv_lock')
+
     def __init__(
         self,
         loop: asyncio.AbstractEventLoop,
@@ -458,9 +639,8 @@ class InputWrapper:
         self.recv_lock = recv_lock
 
     async def __acall__(self, __prompt: str = ""):
-        _human_input = _HumanInput(prompt=__prompt)
         async with self.recv_lock:
-            await self.websocket.send_json(_human_input.dict())
+            await self.websocket.send_text(_dumps({"prompt": __prompt}))
         return await self.websocket.receive_text()
 
     def __call__(self, __prompt: str = ""):
@@ -470,6 +650,8 @@ class InputWrapper:
 
 
 class PrintWrapper:
+    __slots__ = ('loop', 'websocket', 'output_model', '_template')
+
     def __init__(
         self,
         loop: asyncio.AbstractEventLoop,
@@ -479,19 +661,33 @@ class PrintWrapper:
         self.loop = loop
         self.websocket = websocket
         self.output_model = output_model
+        try:
+            self._template = self.output_model(result="", error="", stdout="").dict()
+        except ValidationError:
+            self._template = {"result": "", "error": "", "stdout": ""}
 
     def __call__(self, *args: Any, **kwds: Any) -> Any:
         asyncio.run_coroutine_threadsafe(self.__acall__(*args, **kwds), self.loop)
 
     async def __acall__(self, *args: Any, **kwds: Any) -> Any:
-        await self.websocket.send_json(
-            self.output_model(result="", error="", stdout=" ".join(args)).dict()
-        )
+        payload = self._template.copy()
+        payload["stdout"] = " ".join(map(str, args))
+        await self.websocket.send_text(_dumps(payload))
 
 
 class BuiltinsWrapper:
     """Context manager to wrap builtins with websocket."""
 
+    __slots__ = (
+        'loop',
+        'websocket',
+        'output_model',
+        '_wrap_print',
+        '_wrap_input',
+        '_print',
+        '_input',
+    )
+
     def __init__(
         self,
         loop: asyncio.AbstractEventLoop,
@@ -507,8 +703,6 @@ class BuiltinsWrapper:
         self._wrap_input = wrap_input
 
     def __enter__(self):
-        import builtins
-
         if self._wrap_print:
             self._print = builtins.print
             builtins.print = PrintWrapper(self.loop, self.websocket, self.output_model)
@@ -518,8 +712,6 @@ class BuiltinsWrapper:
             builtins.input = InputWrapper(self.loop, self.websocket, asyncio.Lock())
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        import builtins
-
         if self._wrap_print:
             builtins.print = self._print
 
@@ -5,6 +5,13 @@ from typing import Dict
 import click
 import yaml
 
+try:
+    from yaml import CSafeDumper as YamlDumper
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as YamlDumper
+    from yaml import SafeLoader as YamlLoader
+
 from .errors import (
     InvalidAutoscaleMaxError,
     InvalidAutoscaleMinError,
@@ -36,7 +43,7 @@ class Defaults:
         if os.path.exists(_path):
             # read from config yaml
             with open(_path, 'r') as fp:
-                config = yaml.safe_load(fp.read())
+                config = yaml.load(fp, Loader=YamlLoader)
                 self.instance = config.get('instance', self.instance)
                 self.autoscale_min = config.get('autoscale', {}).get(
                     'min', self.autoscale_min
@@ -116,7 +123,7 @@ class JCloudConfig:
 
 def validate_jcloud_config(config_path):
     with open(config_path, "r") as f:
-        config_data: Dict = yaml.safe_load(f)
+        config_data: Dict = yaml.load(f, Loader=YamlLoader)
         instance: str = config_data.get(INSTANCE)
         autoscale_min: str = config_data.get(AUTOSCALE_MIN)
         autoscale_max: str = config_data.get(AUTOSCALE_MAX)
@@ -210,7 +217,7 @@ def get_jcloud_config(
         return jcloud_config
 
     with open(config_path, 'r') as f:
-        config_data: Dict = yaml.safe_load(f)
+        config_data: Dict = yaml.load(f, Loader=YamlLoader)
         if not config_data:
             return jcloud_config
 
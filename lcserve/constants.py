@@ -0,0 +1,24 @@
+import asyncio
+from enum import Enum
+from functools import wraps
+
+APP_NAME = 'langchain'
+BABYAGI_APP_NAME = 'babyagi'
+PDF_QNA_APP_NAME = 'pdfqna'
+PANDAS_AI_APP_NAME = 'pandasai'
+AUTOGPT_APP_NAME = 'autogpt'
+SLACKBOT_DEMO_APP_NAME = 'slackbot'
+SLACK_BOT_NAME = 'langchain-bot'
+
+
+class ExportKind(str, Enum):
+    KUBERNETES = 'kubernetes'
+    DOCKER_COMPOSE = 'docker-compose'
+
+
+def syncify(f):
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return asyncio.run(f(*args, **kwargs))
+
+    return wrapper
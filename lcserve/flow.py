@@ -1,12 +1,9 @@
-import asyncio
 import inspect
 import os
 import secrets
 import shutil
 import sys
 import tempfile
-from enum import Enum
-from functools import wraps
 from http import HTTPStatus
 from importlib import import_module
 from pathlib import Path
@@ -19,19 +16,22 @@ import requests
 import yaml
 from jina import Flow
 
-from .config import DEFAULT_TIMEOUT, get_jcloud_config
+from .config import DEFAULT_TIMEOUT, YamlDumper, YamlLoader, get_jcloud_config
+from .constants import (
+    APP_NAME,
+    AUTOGPT_APP_NAME,
+    BABYAGI_APP_NAME,
+    PANDAS_AI_APP_NAME,
+    PDF_QNA_APP_NAME,
+    SLACK_BOT_NAME,
+    SLACKBOT_DEMO_APP_NAME,
+    ExportKind,
+    syncify,
+)
 
 if TYPE_CHECKING:
     from fastapi import FastAPI
 
-APP_NAME = 'langchain'
-BABYAGI_APP_NAME = 'babyagi'
-PDF_QNA_APP_NAME = 'pdfqna'
-PANDAS_AI_APP_NAME = 'pandasai'
-AUTOGPT_APP_NAME = 'autogpt'
-SLACKBOT_DEMO_APP_NAME = 'slackbot'
-SLACK_BOT_NAME = 'langchain-bot'
-
 JINA_VERSION = '3.18.0'
 DOCARRAY_VERSION = '0.21.0'
 
@@ -40,14 +40,6 @@ APP_LOGS_URL = "[https://cloud.jina.ai/](https://cloud.jina.ai/user/flows?action
 PRICING_URL = "****{cph}**** ([Read about pricing here](https://github.com/jina-ai/langchain-serve#-pricing))"
 
 
-def syncify(f):
-    @wraps(f)
-    def wrapper(*args, **kwargs):
-        return asyncio.run(f(*args, **kwargs))
-
-    return wrapper
-
-
 def hubble_exists(name: str, secret: Optional[str] = None) -> bool:
     return (
         requests.get(
@@ -302,7 +294,7 @@ def _handle_config_yaml(tmpdir: str, name: str):
                 'name': name,
             },
         }
-        f.write(yaml.safe_dump(config_dict, sort_keys=False))
+        f.write(yaml.dump(config_dict, Dumper=YamlDumper, sort_keys=False))
 
 
 def _push_to_hubble(
@@ -522,7 +514,7 @@ def get_flow_yaml(
     env: str = None,
     lcserve_app: bool = False,
 ) -> str:
-    return yaml.safe_dump(
+    return yaml.dump(
         get_flow_dict(
             module_str=module_str,
             fastapi_app_str=fastapi_app_str,
@@ -535,15 +527,11 @@ def get_flow_yaml(
             env=env,
             lcserve_app=lcserve_app,
         ),
+        Dumper=YamlDumper,
         sort_keys=False,
     )
 
 
-class ExportKind(str, Enum):
-    KUBERNETES = 'kubernetes'
-    DOCKER_COMPOSE = 'docker-compose'
-
-
 def export_app(
     module_str: str,
     fastapi_app_str: str,
@@ -620,7 +608,7 @@ async def deploy_app_on_jcloud(
     with tempfile.TemporaryDirectory() as tmpdir:
         flow_path = os.path.join(tmpdir, 'flow.yml')
         with open(flow_path, 'w') as f:
-            yaml.safe_dump(flow_dict, f, sort_keys=False)
+            yaml.dump(flow_dict, f, Dumper=YamlDumper, sort_keys=False)
 
         deploy_envs = {'JCLOUD_HIDE_SUCCESS_MSG': 'true'} if not verbose else {}
         with EnvironmentVarCtxtManager(deploy_envs):
@@ -812,7 +800,7 @@ def create_slack_app_manifest(name) -> str:
     with open(slackbot_template, 'r') as f:
         slackbot_template = f.read()
 
-    slackbot_dict = yaml.safe_load(slackbot_template)
+    slackbot_dict = yaml.load(slackbot_template, Loader=YamlLoader)
     slackbot_dict['display_information']['name'] = name
     slackbot_dict['features']['bot_user']['display_name'] = name
-    return yaml.dump(slackbot_dict)
+    return yaml.dump(slackbot_dict, Dumper=YamlDumper)
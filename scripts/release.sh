@@ -7,7 +7,7 @@
 
 set -ex
 
-INIT_FILE='lcserve/__init__.py'
+INIT_FILE='lcserve/_version.py'
 VER_TAG='__version__ = '
 RELEASENOTE='./node_modules/.bin/git-release-notes'
 
@@ -20,7 +20,7 @@ if sys.version_info < (3, 7, 0):
 
 try:
     pkg_name = 'langchain-serve'
-    libinfo_py = path.join('lcserve', '__init__.py')
+    libinfo_py = path.join('lcserve', '_version.py')
     libinfo_content = open(libinfo_py, 'r', encoding='utf8').readlines()
     version_line = [l.strip() for l in libinfo_content if l.startswith('__version__')][
         0
@@ -62,9 +62,9 @@ setup(
     install_requires=install_requires,
     entry_points={
         'console_scripts': [
-            'langchain-serve=lcserve.__main__:serve',
-            'lc-serve=lcserve.__main__:serve',
-            'lcserve=lcserve.__main__:serve',
+            'langchain-serve=lcserve._cli:main',
+            'lc-serve=lcserve._cli:main',
+            'lcserve=lcserve._cli:main',
         ],
     },
     extras_require={
@@ -12,7 +12,8 @@ import psutil
 import pytest
 import requests
 
-from lcserve.__main__ import remove_app_on_jcloud, serve_on_jcloud
+from lcserve.__main__ import serve_on_jcloud
+from lcserve.flow import remove_app_on_jcloud
 
 PROMETHEUS_URL = "http://localhost:9090"
 JAEGER_URL = "http://localhost:16686"
@@ -0,0 +1,26 @@
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from lcserve import __version__
+from lcserve._cli import main
+
+
+@pytest.mark.parametrize('flag', ['-v', '--version'])
+def test_version_skips_importing_the_cli(flag, capsys):
+    sys.modules.pop('lcserve.__main__', None)
+    with patch.object(sys, 'argv', ['lc-serve', flag]):
+        main()
+
+    assert capsys.readouterr().out.strip() == f'lc-serve, version {__version__}'
+    assert 'lcserve.__main__' not in sys.modules
+
+
+def test_other_commands_go_through_click(capsys):
+    with patch.object(sys, 'argv', ['lc-serve', '--help']):
+        with pytest.raises(SystemExit) as e:
+            main()
+
+    assert e.value.code == 0
+    assert 'Usage:' in capsys.readouterr().out
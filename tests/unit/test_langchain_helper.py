@@ -0,0 +1,140 @@
+import asyncio
+import json
+import logging
+
+import pytest
+from pydantic import BaseModel
+
+from lcserve.backend.langchain_helper import (
+    AsyncStreamingWebsocketCallbackHandler,
+    StreamingWebsocketCallbackHandler,
+)
+
+
+class Output(BaseModel):
+    result: str
+    error: str
+    stdout: str = ''
+
+
+class FakeWebSocket:
+    def __init__(self, closed: bool = False):
+        self.closed = closed
+        self.messages = []
+
+    async def send_text(self, data: str):
+        if self.closed:
+            raise RuntimeError('websocket is closed')
+        self.messages.append(json.loads(data))
+
+    @property
+    def results(self):
+        return [m['result'] for m in self.messages]
+
+
+@pytest.mark.asyncio
+async def test_tokens_within_interval_are_sent_together():
+    ws = FakeWebSocket()
+    handler = AsyncStreamingWebsocketCallbackHandler(ws, Output, flush_interval=0.05)
+    for token in ['Hello', ', ', 'world']:
+        await handler.on_llm_new_token(token)
+    assert ws.messages == []
+
+    await asyncio.sleep(0.1)
+    assert ws.messages == [{'result': 'Hello, world', 'error': '', 'stdout': ''}]
+
+
+@pytest.mark.asyncio
+async def test_zero_flush_interval_sends_every_token():
+    ws = FakeWebSocket()
+    handler = AsyncStreamingWebsocketCallbackHandler(ws, Output, flush_interval=0)
+    for token in ['a', 'b', 'c']:
+        await handler.on_llm_new_token(token)
+    assert ws.results == ['a', 'b', 'c']
+
+
+@pytest.mark.asyncio
+async def test_flush_size_flushes_immediately():
+    ws = FakeWebSocket()
+    handler = AsyncStreamingWebsocketCallbackHandler(
+        ws, Output, flush_interval=10, flush_size=4
+    )
+    await handler.on_llm_new_token('ab')
+    assert ws.messages == []
+    await handler.on_llm_new_token('cd')
+    assert ws.results == ['abcd']
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('event', ['on_llm_end', 'on_llm_error'])
+async def test_end_of_llm_run_flushes_buffer(event):
+    ws = FakeWebSocket()
+    handler = AsyncStreamingWebsocketCallbackHandler(ws, Output, flush_interval=10)
+    await handler.on_llm_new_token('a')
+    await handler.on_llm_new_token('b')
+    assert ws.messages == []
+
+    await getattr(handler, event)(None)
+    assert ws.results == ['ab']
+
+
+@pytest.mark.asyncio
+async def test_on_text_keeps_order():
+    ws = FakeWebSocket()
+    handler = AsyncStreamingWebsocketCallbackHandler(ws, Output, flush_interval=10)
+    await handler.on_llm_new_token('a')
+    await handler.on_text('text')
+    await handler.on_llm_new_token('b')
+    await handler.on_llm_end(None)
+    assert ws.results == ['a', 'text', 'b']
+
+
+@pytest.mark.asyncio
+async def test_timed_flush_on_closed_websocket_is_logged(caplog):
+    ws = FakeWebSocket(closed=True)
+    handler = AsyncStreamingWebsocketCallbackHandler(ws, Output, flush_interval=0.01)
+    with caplog.at_level(logging.WARNING):
+        await handler.on_llm_new_token('a')
+        await asyncio.sleep(0.05)
+
+    assert 'websocket is closed' in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_sync_handler_from_worker_thread():
+    ws = FakeWebSocket()
+    handler = StreamingWebsocketCallbackHandler(
+        ws, Output, loop=asyncio.get_running_loop(), flush_interval=10
+    )
+
+    def _stream():
+        for token in ['a', 'b', 'c']:
+            handler.on_llm_new_token(token)
+        handler.on_llm_end(None)
+
+    await asyncio.get_running_loop().run_in_executor(None, _stream)
+    assert ws.results == ['abc']
+
+
+@pytest.mark.asyncio
+async def test_sync_handler_on_its_own_loop_does_not_block():
+    ws = FakeWebSocket()
+    handler = StreamingWebsocketCallbackHandler(
+        ws, Output, loop=asyncio.get_running_loop(), flush_interval=0
+    )
+    handler.on_llm_new_token('a')
+    await asyncio.sleep(0.01)
+    assert ws.results == ['a']
+
+
+@pytest.mark.asyncio
+async def test_sync_handler_on_its_own_loop_logs_send_errors(caplog):
+    ws = FakeWebSocket(closed=True)
+    handler = StreamingWebsocketCallbackHandler(
+        ws, Output, loop=asyncio.get_running_loop(), flush_interval=0
+    )
+    with caplog.at_level(logging.WARNING):
+        handler.on_llm_new_token('a')
+        await asyncio.sleep(0.01)
+
+    assert 'websocket is closed' in caplog.text